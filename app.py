@@ -1,18 +1,34 @@
+import csv
+import functools
+import hashlib
+import hmac
+import os
+import re
+import stat
+import tempfile
+import time
+from collections import namedtuple
+from html import escape
 import streamlit as st
+import numpy as np
 import pandas as pd
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from rapidfuzz import fuzz
+from io import BytesIO, StringIO
+from urllib.request import urlopen
+from rapidfuzz import fuzz, process
 
-# Page setup
-st.set_page_config(page_title="Compliance Advisor Pro", layout="wide")
+# Configuration
+SHEET_ID = "1kTLUwg_4-PDY-CsUvTpPv1RIJ59BztKI_qnVOLyF12I"
+SHEET_URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/export?format=csv"
+# The parquet mirror lives in a per-user, owner-only directory: the temp dir is shared with other users
+SHEET_CACHE_DIR = os.path.join(tempfile.gettempdir(), f"compliance-advisor-{os.getuid()}")
+SHEET_CACHE_PATH = os.path.join(SHEET_CACHE_DIR, "compliance_sheet.parquet")
+SHEET_CACHE_TTL = 600  # seconds; the sheet is re-fetched once per slot of this length
+ADMIN_USERNAME = "admin"
+# SHA-256 of the demo password; replace with secure authentication
+ADMIN_PASSWORD_SHA256 = bytes.fromhex("5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8")
 
-# Custom CSS
-st.markdown("""
+# Static page markup
+PAGE_CSS = """
     <style>
         .title { font-size: 2.5em; color: #003366; font-weight: bold; }
         .badge { display: inline-block; padding: 0.25em 0.6em; font-size: 90%; font-weight: 600; border-radius: 0.25rem; }
@@ -24,10 +40,267 @@ st.markdown("""
         .dashboard-card { border-radius: 10px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
         .footer { text-align: center; font-size: 0.9em; color: gray; margin-top: 3rem; }
     </style>
-""", unsafe_allow_html=True)
+"""
+TITLE_HTML = "<div class='title'>🔐 Compliance Advisor Pro</div>"
+FOOTER_HTML = "<div class='footer'>© 2025 Compliance Advisor Pro</div>"
+
+# Keywords used to detect project attributes
+DOMAINS = {
+    "healthcare": ("healthcare", "hospital", "patient", "medical", "health", "phi"),
+    "finance": ("bank", "finance", "payment", "financial", "pci", "credit card"),
+    "ai solutions": ("ai", "artificial intelligence", "machine learning", "ml"),
+    "govt/defense": ("government", "defense", "military", "public sector"),
+    "cloud services": ("cloud", "saas", "iaas", "paas", "aws", "azure", "gcp"),
+    "all": ()
+}
+
+DATA_TYPES = {
+    "PHI": ("phi", "health data", "medical record", "patient data"),
+    "PII": ("pii", "personal data", "name", "email", "address", "phone"),
+    "financial": ("financial", "credit card", "transaction", "bank account"),
+    "sensitive": ("sensitive", "confidential", "proprietary")
+}
+
+REGIONS = {
+    "India": ("india", "indian"),
+    "USA": ("usa", "united states", "us"),
+    "EU": ("eu", "europe", "gdpr"),
+    "Canada": ("canada",),
+    "Brazil": ("brazil", "lgpd"),
+    "global": ("global", "international", "worldwide")
+}
+
+# One category of a keyword group: its verbatim-hit regex (None without keywords)
+# and the slice of KEYWORDS holding its keywords
+KeywordCategory = namedtuple("KeywordCategory", ["name", "pattern", "keywords"])
+# A group's categories in priority order, and its longest keyword
+KeywordGroup = namedtuple("KeywordGroup", ["categories", "longest"])
+
+# Precompute exact-match patterns per category, plus one flattened keyword list
+# across all groups so fuzzy scoring needs a single rapidfuzz call
+def build_keyword_index(groups):
+    index = []
+    keywords = []
+    for group in groups:
+        categories = []
+        for name, kws in group.items():
+            kws = [kw.lower() for kw in kws]
+            pattern = re.compile("|".join(map(re.escape, kws))) if kws else None
+            categories.append(KeywordCategory(name, pattern, slice(len(keywords), len(keywords) + len(kws))))
+            keywords.extend(kws)
+        longest = max((len(kw.lower()) for kws in group.values() for kw in kws), default=0)
+        index.append(KeywordGroup(tuple(categories), longest))
+    return tuple(index), keywords
+
+KEYWORD_GROUPS, KEYWORDS = build_keyword_index((DOMAINS, DATA_TYPES, REGIONS))
+
+# Constant-time login check against the stored credentials
+def check_credentials(username, password):
+    username_ok = hmac.compare_digest(username.encode("utf-8"), ADMIN_USERNAME.encode("utf-8"))
+    password_ok = hmac.compare_digest(hashlib.sha256(password.encode("utf-8")).digest(), ADMIN_PASSWORD_SHA256)
+    return username_ok and password_ok
+
+# Create the mirror directory if needed; False if it exists but is not ours alone,
+# e.g. planted in advance by another user
+def sheet_cache_dir_ready():
+    try:
+        os.makedirs(SHEET_CACHE_DIR, mode=0o700, exist_ok=True)
+        info = os.lstat(SHEET_CACHE_DIR)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o077
+
+# Refresh slot for the current time; the in-memory cache and the mirror both expire at its end,
+# so neither layer extends the other and data is never more than SHEET_CACHE_TTL old
+def sheet_refresh_slot(timestamp):
+    return int(timestamp // SHEET_CACHE_TTL)
+
+# Fetch the sheet, reusing an on-disk parquet copy from the same refresh slot so restarts
+# skip the download and CSV parse
+def fetch_sheet(refresh_slot):
+    use_mirror = sheet_cache_dir_ready()
+    try:
+        if use_mirror and sheet_refresh_slot(os.path.getmtime(SHEET_CACHE_PATH)) == refresh_slot:
+            return pd.read_parquet(SHEET_CACHE_PATH)
+    except Exception:
+        # Missing or unreadable mirror, or no parquet engine: download instead
+        pass
+    # Every cell is text, so skip dtype inference (it would also turn numeric-looking cells into floats)
+    with urlopen(SHEET_URL, timeout=10) as response:
+        df = pd.read_csv(response, dtype=str)
+    if not use_mirror:
+        return df
+    # The mirror is only a shortcut; failing to write it (disk, permissions, or a
+    # pyarrow/serialization error) must not fail the load
+    partial_path = None
+    try:
+        fd, partial_path = tempfile.mkstemp(suffix=".tmp", dir=SHEET_CACHE_DIR)
+        os.close(fd)
+        df.to_parquet(partial_path, index=False)
+        os.replace(partial_path, SHEET_CACHE_PATH)
+    except Exception:
+        if partial_path is not None:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+    return df
+
+# Lowercased, stripped text of a column ('' for blank cells)
+def normalize_column(series):
+    return series.fillna("").astype(str).str.strip().str.lower()
+
+# Comma-separated column values as one boolean indicator column per value, named prefix + value
+def token_flags(series, prefix):
+    tokens = normalize_column(series).str.replace(r"\s*,\s*", ",", regex=True)
+    return tokens.str.get_dummies(sep=",").astype(bool).add_prefix(prefix)
+
+# Rows flagged with any of the given values
+def token_mask(df, prefix, values):
+    columns = [prefix + value for value in values if prefix + value in df.columns]
+    return df[columns].any(axis=1) if columns else pd.Series(False, index=df.index)
+
+# A keyword found verbatim scores 100, so the first category with one wins outright.
+# Texts shorter than a keyword can also score 100 by appearing inside it, so they are left to fuzzy scoring.
+def exact_category(text, group):
+    if len(text) >= group.longest:
+        for category in group.categories:
+            if category.pattern is not None and category.pattern.search(text):
+                return category.name
+    return None
+
+# Detect (domain, data type, region) using RapidFuzz; the keyword tables are constant,
+# so results are kept per text across sheet reloads
+@functools.lru_cache(maxsize=256)
+def classify_description(text, min_score=40):
+    text = text.lower()
+    keyword_scores = None
+    matches = []
+    for group in KEYWORD_GROUPS:
+        match = exact_category(text, group)
+        if match is None:
+            # Score every keyword of every group against the text once, on first need.
+            # Pairs below min_score can never be selected, so rapidfuzz may abandon them early.
+            if keyword_scores is None:
+                keyword_scores = process.cdist(
+                    [text], KEYWORDS, scorer=fuzz.partial_ratio, score_cutoff=min_score, dtype=np.float64
+                )[0]
+            # A category's score is its best keyword's; ties go to the earlier category
+            scores = [keyword_scores[category.keywords].max(initial=0) for category in group.categories]
+            best = int(np.argmax(scores))
+            match = group.categories[best].name if scores[best] >= min_score else "unknown"
+        matches.append(match)
+    return tuple(matches)
+
+# Loaded columns carried into each analysis result, and their names there
+MATCH_COLUMNS = {
+    'Compliance Name': 'name',
+    '_followed': 'followed',
+    '_priority': 'priority',
+    '_alert': 'alert',
+    '_checklist': 'checklist',
+    'Why Required': 'why'
+}
+
+# Cached per description and sheet contents; the DataFrame argument itself is not hashed
+@st.cache_data(ttl=3600, max_entries=128, show_spinner=False)
+def analyze_project(description, _compliance_df, data_version):
+    matched_domain, matched_data_type, matched_region = classify_description(description)
+
+    region = matched_region.lower()
+    data_type = matched_data_type.lower()
+    domain_mask = token_mask(_compliance_df, "_domain:", ("all", matched_domain))
+    applies_mask = token_mask(_compliance_df, "_applies:", ("all", region, data_type))
+    # Matches stay columnar: one row per requirement, columns named after MATCH_COLUMNS values
+    compliance_matches = (
+        _compliance_df.loc[domain_mask & applies_mask, list(MATCH_COLUMNS)]
+        .rename(columns=MATCH_COLUMNS)
+        .reset_index(drop=True)
+    )
+
+    return {
+        "domain": matched_domain,
+        "data_type": matched_data_type,
+        "region": matched_region,
+        "compliance_matches": compliance_matches
+    }
+
+# Report styles shared by every PDF; reportlab is only imported once a report is requested
+PDF_TABLE_HEADER = ["Requirement", "Status", "Priority", "Checklist"]
+
+@functools.lru_cache(maxsize=None)
+def pdf_styles():
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import TableStyle
+    table_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#003366")),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('INNERGRID', (0,0), (-1,-1), 0.5, colors.grey),
+        ('BOX', (0,0), (-1,-1), 0.5, colors.grey)
+    ])
+    return getSampleStyleSheet(), [2*inch, 1*inch, 1*inch, 2*inch], table_style
+
+# Generate PDF, built once per analysis result
+@st.cache_data(max_entries=32, show_spinner=False)
+def generate_pdf_report(project_info, compliance_data):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    styles, column_widths, table_style = pdf_styles()
+
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    data = [PDF_TABLE_HEADER]
+    data.extend(
+        [item.name, "Followed" if item.followed else "Pending", item.priority, ", ".join(item.checklist)]
+        for item in compliance_data.itertuples(index=False)
+    )
+    table = Table(data, colWidths=column_widths, repeatRows=1)
+    table.setStyle(table_style)
+    heading = styles['Heading2']
+    story = [
+        Paragraph("Compliance Assessment Report", styles['Title']),
+        Spacer(1, 12),
+        Paragraph("Project Details", heading),
+        Paragraph(f"<b>Domain:</b> {project_info['domain']}<br/><b>Data Type:</b> {project_info['data_type']}<br/><b>Region:</b> {project_info['region']}", styles['BodyText']),
+        Spacer(1, 12),
+        Paragraph("Compliance Status", heading),
+        table
+    ]
+    doc.build(story)
+    return buffer.getvalue()
+
+# Generate CSV action plan for the requirements that are not yet followed
+ACTION_PLAN_COLUMNS = ["Requirement", "Priority", "Deadline", "Actions", "Owner", "Status"]
+
+def generate_action_plan_csv(compliance_data):
+    buffer = StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(ACTION_PLAN_COLUMNS)
+    pending = compliance_data[~compliance_data['followed']]
+    writer.writerows(
+        (
+            item.name,
+            item.priority,
+            "30 days" if item.priority=="High" else "90 days",
+            "; ".join(item.checklist),
+            "[Assign Owner]",
+            "Not Started"
+        )
+        for item in pending.itertuples(index=False)
+    )
+    return buffer.getvalue().encode("utf-8")
+
+# Page setup
+st.set_page_config(page_title="Compliance Advisor Pro", layout="wide")
+
+# Custom CSS
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 # Header
-st.markdown("<div class='title'>🔐 Compliance Advisor Pro</div>", unsafe_allow_html=True)
+st.markdown(TITLE_HTML, unsafe_allow_html=True)
 st.markdown("AI-powered compliance analysis for your exact requirements")
 
 # User Authentication
@@ -40,7 +313,7 @@ if st.session_state.username is None:
     password = st.text_input("Password", type="password")
     
     if st.button("Login"):
-        if username == "admin" and password == "password":  # Replace with secure authentication
+        if check_credentials(username, password):
             st.session_state.username = username
             st.success("Logged in successfully!")
         else:
@@ -48,13 +321,11 @@ if st.session_state.username is None:
 else:
     st.success(f"Welcome, {st.session_state.username}!")
 
-    # Load data from Google Sheets
-    @st.cache_data
-    def load_data():
-        sheet_id = "1kTLUwg_4-PDY-CsUvTpPv1RIJ59BztKI_qnVOLyF12I"
-        sheet_url = f"https://docs.google.com/spreadsheets/d/{sheet_id}/export?format=csv"
+    # Load data from Google Sheets once per refresh slot; ttl only evicts past slots
+    @st.cache_data(ttl=SHEET_CACHE_TTL, show_spinner=False)
+    def load_data(refresh_slot):
         try:
-            df = pd.read_csv(sheet_url)
+            df = fetch_sheet(refresh_slot)
             
             # Validate columns
             required_cols = [
@@ -67,205 +338,127 @@ else:
             if missing_cols:
                 st.error(f"Missing required columns: {', '.join(missing_cols)}")
                 st.stop()
-                
+
+            # Fingerprint the sheet contents, row order included, so cached analyses are dropped when it changes
+            row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+            df.attrs['version'] = hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+            # Normalize the matching fields once per load instead of on every analysis
+            flags = pd.concat([token_flags(df['Domain'], "_domain:"), token_flags(df['Applies To'], "_applies:")], axis=1)
+            df[flags.columns] = flags
+            df['_followed'] = normalize_column(df['Followed By Compunnel']).eq("yes")
+            df['_priority'] = pd.Categorical(
+                np.where(normalize_column(df['Priority']).eq("high"), "High", "Standard"),
+                categories=["High", "Standard"]
+            )
+            df['_alert'] = normalize_column(df['Trigger Alert']).eq("yes")
+            # Cells are read as text, so only the blank ones need dropping
+            checklist = df[['Checklist 1', 'Checklist 2', 'Checklist 3']].to_numpy(dtype=object)
+            present = pd.notna(checklist)
+            df['_checklist'] = [tuple(items[keep]) for items, keep in zip(checklist, present)]
             return df
         except Exception as e:
             st.error(f"Failed to load data: {str(e)}")
             st.stop()
 
-    compliance_df = load_data()
-
-    # Project input
-    project_description = st.text_area(
-        "Describe your project (include data types and regions):",
-        height=150,
-        placeholder="e.g., 'Healthcare app storing patient records in India with EU users...'"
-    )
-
-    # Matching function using RapidFuzz
-    def match_category(text, categories, min_score=40):
-        text = text.lower()
-        scores = {}
-        for category, keywords in categories.items():
-            max_score = 0
-            for kw in keywords:
-                score = fuzz.partial_ratio(kw.lower(), text)
-                if score > max_score:
-                    max_score = score
-            scores[category] = max_score
-        best_category = max(scores, key=scores.get)
-        if scores[best_category] >= min_score:
-            return best_category
-        return "unknown"
-
-    def analyze_project(description):
-        domains = {
-            "healthcare": ["healthcare", "hospital", "patient", "medical", "health", "phi"],
-            "finance": ["bank", "finance", "payment", "financial", "pci", "credit card"],
-            "ai solutions": ["ai", "artificial intelligence", "machine learning", "ml"],
-            "govt/defense": ["government", "defense", "military", "public sector"],
-            "cloud services": ["cloud", "saas", "iaas", "paas", "aws", "azure", "gcp"],
-            "all": []
-        }
-        
-        data_types = {
-            "PHI": ["phi", "health data", "medical record", "patient data"],
-            "PII": ["pii", "personal data", "name", "email", "address", "phone"],
-            "financial": ["financial", "credit card", "transaction", "bank account"],
-            "sensitive": ["sensitive", "confidential", "proprietary"]
-        }
-        
-        regions = {
-            "India": ["india", "indian"],
-            "USA": ["usa", "united states", "us"],
-            "EU": ["eu", "europe", "gdpr"],
-            "Canada": ["canada"],
-            "Brazil": ["brazil", "lgpd"],
-            "global": ["global", "international", "worldwide"]
-        }
-        
-        matched_domain = match_category(description, domains)
-        matched_data_type = match_category(description, data_types)
-        matched_region = match_category(description, regions)
-        
-        compliance_matches = []
-        for _, row in compliance_df.iterrows():
-            row_domains = [x.strip().lower() for x in str(row['Domain']).split(",")]
-            row_applies = [x.strip().lower() for x in str(row['Applies To']).split(",")]
-            domain_match = "all" in row_domains or matched_domain in row_domains
-            applies_match = "all" in row_applies or matched_region.lower() in row_applies or matched_data_type.lower() in row_applies
-            
-            if domain_match and applies_match:
-                checklist = [str(item) for item in [row['Checklist 1'], row['Checklist 2'], row['Checklist 3']] if pd.notna(item)]
-                compliance_matches.append({
-                    "name": row['Compliance Name'],
-                    "domain": str(row['Domain']).lower(),
-                    "applies_to": row_applies,
-                    "followed": str(row['Followed By Compunnel']).strip().lower() == "yes",
-                    "priority": "High" if str(row.get('Priority', '')).strip().lower() == "high" else "Standard",
-                    "alert": str(row.get('Trigger Alert', 'No')).strip().lower() == "yes",
-                    "checklist": checklist,
-                    "why": row.get("Why Required", "")
-                })
-        
-        return {
-            "domain": matched_domain,
-            "data_type": matched_data_type,
-            "region": matched_region,
-            "compliance_matches": compliance_matches
-        }
-
     # Display compliance matches inline
     def display_compliance(compliance_matches):
-        for item in compliance_matches:
-            status = "✅ Followed" if item['followed'] else "❌ Pending"
-            color = "#d4edda" if item['followed'] else "#f8d7da"
-            st.markdown(f"""
+        # One markdown element for the whole list; sheet values are escaped since the HTML is rendered raw
+        blocks = []
+        for item in compliance_matches.itertuples(index=False):
+            status = "✅ Followed" if item.followed else "❌ Pending"
+            color = "#d4edda" if item.followed else "#f8d7da"
+            blocks.append(f"""
             <div style='background-color:{color}; padding:10px; margin-bottom:5px; border-radius:5px;'>
-                <strong>{item['name']}</strong> - {status}<br/>
-                Priority: {item['priority']}<br/>
-                Checklist: {', '.join(item['checklist'])}<br/>
-                Why Required: {item['why']}
+                <strong>{escape(str(item.name))}</strong> - {status}<br/>
+                Priority: {item.priority}<br/>
+                Checklist: {escape(', '.join(item.checklist))}<br/>
+                Why Required: {escape(str(item.why))}
             </div>
-            """, unsafe_allow_html=True)
-
-    # Generate PDF
-    def generate_pdf_report(project_info, compliance_data):
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-        story.append(Paragraph("Compliance Assessment Report", styles['Title']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("Project Details", styles['Heading2']))
-        story.append(Paragraph(f"<b>Domain:</b> {project_info['domain']}<br/><b>Data Type:</b> {project_info['data_type']}<br/><b>Region:</b> {project_info['region']}", styles['BodyText']))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("Compliance Status", styles['Heading2']))
-        data = [["Requirement", "Status", "Priority", "Checklist"]]
-        for item in compliance_data:
-            status = "Followed" if item['followed'] else "Pending"
-            checklist = ", ".join(item['checklist'])
-            data.append([item['name'], status, item['priority'], checklist])
-        table = Table(data, colWidths=[2*inch, 1*inch, 1*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#003366")),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.grey),
-            ('BOX', (0,0), (-1,-1), 0.5, colors.grey)
-        ]))
-        story.append(table)
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
-
-    if st.button("🔍 Analyze Compliance", type="primary"):
-        if not project_description.strip():
-            st.warning("Please enter a project description")
-            st.stop()
-        with st.spinner("Analyzing requirements..."):
-            results = analyze_project(project_description)
-            st.session_state.results = results
-            st.success("Analysis complete!")
+            """)
+        if blocks:
+            st.markdown("".join(blocks), unsafe_allow_html=True)
+
+    # Analysis and reports rerun on their own when their widgets change,
+    # without re-running login, page styling or the data load
+    @st.fragment
+    def analysis_section():
+        # Project input
+        project_description = st.text_area(
+            "Describe your project (include data types and regions):",
+            height=150,
+            placeholder="e.g., 'Healthcare app storing patient records in India with EU users...'"
+        )
+
+        if st.button("🔍 Analyze Compliance", type="primary"):
+            if not project_description.strip():
+                st.warning("Please enter a project description")
+                return
+            with st.spinner("Analyzing requirements..."):
+                # The sheet is only needed once an analysis is requested
+                compliance_df = load_data(sheet_refresh_slot(time.time()))
+                # Classification ignores case, so lowercase before the call to share cache entries
+                results = analyze_project(project_description.lower(), compliance_df, compliance_df.attrs['version'])
+                st.session_state.results = results
+                st.success("Analysis complete!")
+
+                compliance_matches = results['compliance_matches']
+                total = len(compliance_matches)
+                followed = int(compliance_matches['followed'].sum())
+                pending = total - followed
+                score = int((followed / total)*100) if total else 0
+                high_priority_pending = int((~compliance_matches['followed'] & compliance_matches['priority'].eq("High")).sum())
 
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Compliance Score", f"{score}%")
+                with col2:
+                    st.metric("Pending Requirements", pending)
+                with col3:
+                    st.metric("High Priority Items", high_priority_pending)
+
+                st.markdown("### 📌 Detected Project Attributes")
+                att_col1, att_col2, att_col3 = st.columns(3)
+                with att_col1:
+                    st.markdown(f"**Domain:** {results['domain']}")
+                with att_col2:
+                    st.markdown(f"**Data Type:** {results['data_type']}")
+                with att_col3:
+                    st.markdown(f"**Region:** {results['region']}")
+
+                st.markdown("### 📋 Compliance Details")
+                display_compliance(compliance_matches)
+
+        # Generate Reports
+        if st.session_state.get('results'):
+            st.markdown("---")
+            st.markdown("## 📤 Generate Reports")
+            format_choice = st.radio("Select report type:", ["PDF Report", "Action Plan (CSV)"], horizontal=True)
+            results = st.session_state.results
             compliance_matches = results['compliance_matches']
-            total = len(compliance_matches)
-            followed = len([c for c in compliance_matches if c['followed']])
-            pending = total - followed
-            score = int((followed / total)*100) if total else 0
-            high_priority_pending = len([c for c in compliance_matches if not c['followed'] and c['priority']=="High"])
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Compliance Score", f"{score}%")
-            with col2:
-                st.metric("Pending Requirements", pending)
-            with col3:
-                st.metric("High Priority Items", high_priority_pending)
-
-            st.markdown("### 📌 Detected Project Attributes")
-            att_col1, att_col2, att_col3 = st.columns(3)
-            with att_col1:
-                st.markdown(f"**Domain:** {results['domain']}")
-            with att_col2:
-                st.markdown(f"**Data Type:** {results['data_type']}")
-            with att_col3:
-                st.markdown(f"**Region:** {results['region']}")
-
-            st.markdown("### 📋 Compliance Details")
-            display_compliance(compliance_matches)
-
-    # Generate Reports
-    if st.session_state.get('results'):
-        st.markdown("---")
-        st.markdown("## 📤 Generate Reports")
-        format_choice = st.radio("Select report type:", ["PDF Report", "Action Plan (CSV)"], horizontal=True)
-        results = st.session_state.results
-        compliance_matches = results['compliance_matches']
-        project_info = {
-            "domain": results['domain'],
-            "data_type": results['data_type'],
-            "region": results['region']
-        }
-
-        if format_choice == "PDF Report":
-            pdf_buffer = generate_pdf_report(project_info, compliance_matches)
-            st.download_button("⬇️ Download PDF Report", pdf_buffer, "compliance_report.pdf", "application/pdf")
-        else:
-            action_items = []
-            for item in compliance_matches:
-                if not item['followed']:
-                    action_items.append({
-                        "Requirement": item['name'],
-                        "Priority": item['priority'],
-                        "Deadline": "30 days" if item['priority']=="High" else "90 days",
-                        "Actions": "; ".join(item['checklist']),
-                        "Owner": "[Assign Owner]",
-                        "Status": "Not Started"
-                    })
-            df = pd.DataFrame(action_items)
-            csv = df.to_csv(index=False)
-            st.download_button("⬇️ Download Action Plan", csv, "compliance_action_plan.csv", "text/csv")
+            project_info = {
+                "domain": results['domain'],
+                "data_type": results['data_type'],
+                "region": results['region']
+            }
+
+            # Reports are only built when the download is actually requested
+            if format_choice == "PDF Report":
+                st.download_button(
+                    "⬇️ Download PDF Report",
+                    lambda: generate_pdf_report(project_info, compliance_matches),
+                    "compliance_report.pdf",
+                    "application/pdf"
+                )
+            else:
+                st.download_button(
+                    "⬇️ Download Action Plan",
+                    lambda: generate_action_plan_csv(compliance_matches),
+                    "compliance_action_plan.csv",
+                    "text/csv"
+                )
+
+    analysis_section()
 
     st.markdown("---")
-    st.markdown("<div class='footer'>© 2025 Compliance Advisor Pro</div>", unsafe_allow_html=True)
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)